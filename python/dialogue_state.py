@@ -4,6 +4,8 @@
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 
+ENTITY_FIELDS = ("universities", "programs", "locations", "tests", "deadlines")
+
 
 @dataclass
 class DialogueState:
@@ -34,8 +36,7 @@ def merge_state(state: DialogueState, intent: Optional[str], entities: Dict) ->
         state.last_intent = intent
 
     # Add new entities while keeping old ones (no duplicates)
-    entity_fields = ["universities", "programs", "locations", "tests", "deadlines"]
-    for field_name in entity_fields:
+    for field_name in ENTITY_FIELDS:
         incoming = entities.get(field_name, [])
         if incoming:
             current = getattr(state, field_name)
@@ -50,28 +51,29 @@ def merge_state(state: DialogueState, intent: Optional[str], entities: Dict) ->
     return state
 
 
+# (label, attribute) for each part of the context string
+_CONTEXT_FIELDS = (
+    ("intent", "last_intent"),
+    ("universities", "universities"),
+    ("programs", "programs"),
+    ("locations", "locations"),
+    ("tests", "tests"),
+    ("deadlines", "deadlines"),
+    ("scores", "scores"),
+)
+
+
 def state_to_context_string(state: DialogueState) -> str:
     """
     Convert state to a readable string for debugging or logging.
     
     This helps us see what the chatbot "knows" at any point.
     """
-    parts = []
-    
-    if state.last_intent:
-        parts.append(f"intent={state.last_intent}")
-    if state.universities:
-        parts.append(f"universities={state.universities}")
-    if state.programs:
-        parts.append(f"programs={state.programs}")
-    if state.locations:
-        parts.append(f"locations={state.locations}")
-    if state.tests:
-        parts.append(f"tests={state.tests}")
-    if state.deadlines:
-        parts.append(f"deadlines={state.deadlines}")
-    if state.scores:
-        parts.append(f"scores={state.scores}")
+    parts = [
+        f"{label}={value}"
+        for label, attr in _CONTEXT_FIELDS
+        if (value := getattr(state, attr))
+    ]
 
     return " | ".join(parts) if parts else "(no context)"
 
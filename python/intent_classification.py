@@ -1,10 +1,13 @@
 # Intent Classification for EduVerse USA Chatbot
 # Classifies user queries into categories: admissions, sop, scholarships, test_prep
 
+from collections import Counter
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
+from scipy.sparse import csr_matrix
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import classification_report, confusion_matrix
@@ -13,12 +16,117 @@ from sklearn.model_selection import train_test_split
 # Define possible intents
 INTENTS = ["admissions", "sop", "scholarships", "test_prep"]
 
-@dataclass
+# With at most this many training examples we use k-NN instead of Logistic Regression
+KNN_MAX_TRAINING_SIZE = 500
+KNN_NEIGHBORS = 3
+
 class IntentPrediction:
-    """Result of classifying a user query."""
-    intent: str
-    confidence: float
-    probabilities: Dict[str, float]
+    """
+    Result of classifying a user query.
+    
+    Predictions from predict_intents keep the per-class scores as a small
+    array; the probabilities dict is only built if someone reads it.
+    Passing probabilities= directly still works as before.
+    """
+
+    def __init__(
+        self,
+        intent: str,
+        confidence: float,
+        probabilities: Optional[Dict[str, float]] = None,
+        *,
+        _probs: Optional[np.ndarray] = None,
+        _classes: Tuple[str, ...] = (),
+    ):
+        self.intent = intent
+        self.confidence = confidence
+        # Copy so a row doesn't keep the whole batch matrix alive
+        self._probs = None if _probs is None else _probs.copy()
+        self._classes = _classes
+        if probabilities is not None:
+            # Pre-fill the cached_property so it's returned as given
+            self.__dict__["probabilities"] = probabilities
+
+    @cached_property
+    def probabilities(self) -> Dict[str, float]:
+        """Probability (or vote share) for every intent class."""
+        if self._probs is None:
+            return {}
+        return dict(zip(self._classes, self._probs.tolist()))
+
+    def __repr__(self) -> str:
+        return (
+            f"IntentPrediction(intent={self.intent!r}, confidence={self.confidence!r}, "
+            f"probabilities={self.probabilities!r})"
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, IntentPrediction):
+            return NotImplemented
+        return (self.intent, self.confidence, self.probabilities) == (
+            other.intent, other.confidence, other.probabilities
+        )
+
+
+@dataclass
+class KNNIntentModel:
+    """
+    Nearest-neighbour classifier over the cached TF-IDF training vectors.
+    
+    For a handful of labeled examples this is as accurate as Logistic
+    Regression and prediction is just one sparse dot product + a vote.
+    Exposes predict/predict_proba/classes_ like a scikit-learn model.
+    """
+    train_vecs: csr_matrix
+    labels: np.ndarray
+    classes_: np.ndarray
+    k: int = KNN_NEIGHBORS
+
+    def vote(self, sims: np.ndarray) -> Dict[str, float]:
+        """
+        Similarity-weighted vote of the k nearest neighbours.
+        
+        Takes the similarities of one query to every training example and
+        returns each voted class's share (summing to 1).
+        Weighting by similarity breaks ties when each class only has
+        one or two examples. With no word overlap at all, the neighbours
+        would be arbitrary, so every class gets an equal share instead.
+        """
+        if sims.max(initial=0.0) <= 0:
+            return {str(cls): 1.0 / len(self.classes_) for cls in self.classes_}
+
+        k = min(self.k, len(sims))
+        top = np.argpartition(-sims, k - 1)[:k]
+        weights = sims[top]
+
+        votes: Counter = Counter()
+        for label, weight in zip(self.labels[top], weights):
+            votes[str(label)] += float(weight)
+        total = sum(votes.values())
+        return {label: weight / total for label, weight in votes.items()}
+
+    def similarities(self, X: csr_matrix) -> np.ndarray:
+        """Cosine similarity of each training example (rows) to each query (columns)."""
+        # TF-IDF rows are L2-normalized, so a sparse dot product is the cosine
+        return (self.train_vecs @ X.T).toarray()
+
+    def predict_proba(self, X: csr_matrix) -> np.ndarray:
+        """Vote shares per class, in the order of classes_."""
+        class_pos = {cls: i for i, cls in enumerate(self.classes_)}
+        probabilities = np.zeros((X.shape[0], len(self.classes_)))
+
+        for row, sims in enumerate(self.similarities(X).T):
+            for cls, share in self.vote(sims).items():
+                probabilities[row, class_pos[cls]] = share
+
+        return probabilities
+
+    def predict(self, X: csr_matrix) -> np.ndarray:
+        """Majority-vote label for each row of X."""
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+IntentModel = Union[LogisticRegression, KNNIntentModel]
 
 def build_training_dataset() -> Tuple[List[str], List[str]]:
     """
@@ -48,9 +156,12 @@ def build_training_dataset() -> Tuple[List[str], List[str]]:
     
     return texts, labels
 
-def train_intent_model(texts: List[str], labels: List[str]) -> Tuple[LogisticRegression, TfidfVectorizer]:
+def train_intent_model(texts: List[str], labels: List[str]) -> Tuple[IntentModel, TfidfVectorizer]:
     """
-    Train a classifier using TF-IDF features and Logistic Regression.
+    Train a classifier using TF-IDF features.
+    
+    Small datasets get a k-NN model over the training vectors;
+    larger ones fall back to Logistic Regression.
     """
     # Use 50% test size to ensure each class appears in test set
     X_train, X_test, y_train, y_test = train_test_split(
@@ -70,9 +181,18 @@ def train_intent_model(texts: List[str], labels: List[str]) -> Tuple[LogisticReg
     X_train_vec = vectorizer.fit_transform(X_train)
     X_test_vec = vectorizer.transform(X_test)
 
-    # Train Logistic Regression model
-    model = LogisticRegression(max_iter=200)
-    model.fit(X_train_vec, y_train)
+    if len(X_train) <= KNN_MAX_TRAINING_SIZE:
+        # Tiny dataset: keep the training vectors and vote at predict time
+        y_array = np.asarray(y_train)
+        model = KNNIntentModel(
+            train_vecs=csr_matrix(X_train_vec),
+            labels=y_array,
+            classes_=np.unique(y_array),
+        )
+    else:
+        # Train Logistic Regression model
+        model = LogisticRegression(max_iter=200)
+        model.fit(X_train_vec, y_train)
 
     # Evaluate
     y_pred = model.predict(X_test_vec)
@@ -83,22 +203,51 @@ def train_intent_model(texts: List[str], labels: List[str]) -> Tuple[LogisticReg
 
     return model, vectorizer
 
-def predict_intent(model: LogisticRegression, vectorizer: TfidfVectorizer, text: str) -> IntentPrediction:
+def predict_intent(model: IntentModel, vectorizer: TfidfVectorizer, text: str) -> IntentPrediction:
     """
     Predict intent with confidence scores.
     """
-    vec = vectorizer.transform([text])
-    probabilities = model.predict_proba(vec)[0]
-    classes = model.classes_
+    return predict_intents(model, vectorizer, [text])[0]
+
+def predict_intents(model: IntentModel, vectorizer: TfidfVectorizer, texts: List[str]) -> List[IntentPrediction]:
+    """
+    Predict intents for a batch of queries at once.
     
-    prob_map = {cls: float(p) for cls, p in zip(classes, probabilities)}
-    best_idx = int(np.argmax(probabilities))
+    One transform and one similarity/probability call covers every text,
+    which is much cheaper than calling predict_intent in a loop.
+    """
+    if not texts:
+        return []
 
-    return IntentPrediction(
-        intent=str(classes[best_idx]),
-        confidence=float(probabilities[best_idx]),
-        probabilities=prob_map,
-    )
+    X = vectorizer.transform(texts)
+    classes = tuple(str(cls) for cls in model.classes_)
+
+    if isinstance(model, KNNIntentModel):
+        # Sparse k-NN path: use the vote shares directly, no dense
+        # probability matrix. Ties go to the first class, as with argmax.
+        predictions = []
+        for sims in model.similarities(X).T:
+            shares = model.vote(sims)
+            intent = max(classes, key=lambda cls: shares.get(cls, 0.0))
+            predictions.append(IntentPrediction(
+                intent=intent,
+                confidence=shares[intent],
+                probabilities={cls: shares.get(cls, 0.0) for cls in classes},
+            ))
+        return predictions
+
+    P = model.predict_proba(X)
+    best = P.argmax(axis=1)
+
+    return [
+        IntentPrediction(
+            intent=classes[best_idx],
+            confidence=probabilities[best_idx].item(),
+            _probs=probabilities,
+            _classes=classes,
+        )
+        for probabilities, best_idx in zip(P, best)
+    ]
 
 if __name__ == "__main__":
     # Build dataset
@@ -117,8 +266,8 @@ if __name__ == "__main__":
 
     print("\nIntent Prediction Demo")
     print("=" * 60)
-    for sample in demo_queries:
-        prediction = predict_intent(model, vectorizer, sample)
+    predictions = predict_intents(model, vectorizer, demo_queries)
+    for sample, prediction in zip(demo_queries, predictions):
         print(f"Input: {sample}")
         print(f"Intent: {prediction.intent}")
         print(f"Confidence: {prediction.confidence:.2%}")
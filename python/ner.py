@@ -5,6 +5,11 @@ import re
 from dataclasses import dataclass
 from typing import Dict, List
 
+try:
+    import ahocorasick
+except ImportError:  # optional: fall back to a plain substring scan
+    ahocorasick = None
+
 
 @dataclass
 class Entities:
@@ -57,6 +62,44 @@ SCORE_PATTERNS = {
 }
 
 
+def _compile_alternation(patterns: List[str]) -> re.Pattern:
+    """Join a list of patterns into one regex so the text is scanned once."""
+    return re.compile("|".join(f"(?:{p})" for p in patterns))
+
+
+# Compiled once at import instead of on every call.
+# Program and deadline patterns stay separate because their matches can
+# overlap (e.g. "ms in computer science" and "computer science", or
+# "due 12" and "12/15/2026").
+_TEST_RE = _compile_alternation(TEST_PATTERNS)
+_PROGRAM_RES = [re.compile(p) for p in PROGRAM_PATTERNS]
+_DEADLINE_RES = [re.compile(p) for p in DEADLINE_PATTERNS]
+_SCORE_RES = {name: re.compile(p) for name, p in SCORE_PATTERNS.items()}
+_STATE_RE = re.compile(r"\b(" + "|".join(s.lower() for s in US_STATE_ABBREVIATIONS) + r")\b")
+
+
+def _build_university_automaton():
+    """Aho-Corasick automaton over the gazetteer (None if unavailable)."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for name in UNIVERSITY_GAZETTEER:
+        automaton.add_word(name, name)
+    automaton.make_automaton()
+    return automaton
+
+
+# Finds every gazetteer name in one pass over the text
+_UNI_AC = _build_university_automaton()
+
+
+def _find_universities(text_lower: str) -> List[str]:
+    """Return the gazetteer names that appear in the text."""
+    if _UNI_AC is None:
+        return [u for u in UNIVERSITY_GAZETTEER if u in text_lower]
+    return list({name for _, name in _UNI_AC.iter(text_lower)})
+
+
 def extract_entities(text: str) -> Entities:
     """
     Extract all academic entities from user text.
@@ -67,37 +110,28 @@ def extract_entities(text: str) -> Entities:
     text_lower = text.lower()
 
     # Find university names
-    universities = [u for u in UNIVERSITY_GAZETTEER if u in text_lower]
+    universities = _find_universities(text_lower)
 
     # Find program mentions
     programs: List[str] = []
-    for pattern in PROGRAM_PATTERNS:
-        matches = re.finditer(pattern, text_lower)
-        programs.extend(m.group(0).strip() for m in matches)
+    for pattern in _PROGRAM_RES:
+        programs.extend(m.group(0).strip() for m in pattern.finditer(text_lower))
 
     # Find test names
-    tests: List[str] = []
-    for pattern in TEST_PATTERNS:
-        matches = re.finditer(pattern, text_lower)
-        tests.extend(m.group(0).upper() for m in matches)
-    tests = sorted(set(tests))
+    tests = sorted({m.group(0).upper() for m in _TEST_RE.finditer(text_lower)})
 
     # Find US state mentions
-    locations: List[str] = []
-    for state in US_STATE_ABBREVIATIONS:
-        if re.search(rf"\b{state.lower()}\b", text_lower):
-            locations.append(state)
+    locations = list(dict.fromkeys(m.upper() for m in _STATE_RE.findall(text_lower)))
 
     # Find deadline mentions
     deadlines: List[str] = []
-    for pattern in DEADLINE_PATTERNS:
-        matches = re.finditer(pattern, text_lower)
-        deadlines.extend(m.group(0).strip() for m in matches)
+    for pattern in _DEADLINE_RES:
+        deadlines.extend(m.group(0).strip() for m in pattern.finditer(text_lower))
 
     # Find score values
     scores: Dict[str, str] = {}
-    for score_type, pattern in SCORE_PATTERNS.items():
-        match = re.search(pattern, text_lower)
+    for score_type, pattern in _SCORE_RES.items():
+        match = pattern.search(text_lower)
         if match:
             scores[score_type] = match.group(1)
 
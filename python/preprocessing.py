@@ -3,7 +3,8 @@
 
 import re
 from dataclasses import dataclass
-from typing import List
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Tuple
 
 import nltk
 from nltk.corpus import stopwords
@@ -11,9 +12,13 @@ from nltk.stem import WordNetLemmatizer
 from nltk.tokenize import word_tokenize
 
 
-@dataclass
+@dataclass(frozen=True)
 class PreprocessConfig:
-    """Settings for text preprocessing - toggle each step on/off."""
+    """
+    Settings for text preprocessing - toggle each step on/off.
+    
+    Frozen so it can be used as part of the preprocess() cache key.
+    """
     lowercase: bool = True
     remove_urls: bool = True
     remove_emails: bool = True
@@ -23,13 +28,32 @@ class PreprocessConfig:
     language: str = "english"
 
 
+# Noise patterns for normalize_text, compiled once and applied in this order
+_URL_RE = re.compile(r"https?://\S+|www\.\S+")
+_EMAIL_RE = re.compile(r"\b[\w\.-]+@[\w\.-]+\.\w+\b")
+_SPECIAL_CHAR_RE = re.compile(r"[^a-z0-9\s\.,\+\-]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Shared across calls instead of being rebuilt for every query
+_LEMMATIZER = WordNetLemmatizer()
+_STOPWORDS_CACHE: Dict[str, FrozenSet[str]] = {}
+
+
+@lru_cache(maxsize=None)
 def ensure_nltk_resources():
-    """Download NLTK data if not already present."""
+    """Download NLTK data if not already present (once per process)."""
     resources = ["punkt", "stopwords", "wordnet", "omw-1.4"]
     for resource in resources:
         nltk.download(resource, quiet=True)
 
 
+def _get_stopwords(language: str) -> FrozenSet[str]:
+    """Stopword set for a language, loaded on first use."""
+    if language not in _STOPWORDS_CACHE:
+        _STOPWORDS_CACHE[language] = frozenset(stopwords.words(language))
+    return _STOPWORDS_CACHE[language]
+
+
 def normalize_text(text: str, config: PreprocessConfig) -> str:
     """
     Clean raw text by removing noise.
@@ -43,16 +67,16 @@ def normalize_text(text: str, config: PreprocessConfig) -> str:
         result = result.lower()
 
     if config.remove_urls:
-        result = re.sub(r"https?://\S+|www\.\S+", " ", result)
+        result = _URL_RE.sub(" ", result)
 
     if config.remove_emails:
-        result = re.sub(r"\b[\w\.-]+@[\w\.-]+\.\w+\b", " ", result)
+        result = _EMAIL_RE.sub(" ", result)
 
     if config.remove_special_chars:
-        result = re.sub(r"[^a-z0-9\s\.,\+\-]", " ", result)
+        result = _SPECIAL_CHAR_RE.sub(" ", result)
 
     if config.collapse_whitespace:
-        result = re.sub(r"\s+", " ", result).strip()
+        result = _WHITESPACE_RE.sub(" ", result).strip()
 
     return result
 
@@ -63,29 +87,34 @@ def preprocess(text: str, config: PreprocessConfig | None = None) -> List[str]:
     
     Steps: normalize -> tokenize -> remove stopwords -> lemmatize
     Returns a list of clean tokens ready for further processing.
+    Results are cached, so repeated utterances are a dictionary lookup.
     """
     config = config or PreprocessConfig()
+    return list(_preprocess_cached(text, config))
+
+
+@lru_cache(maxsize=4096)
+def _preprocess_cached(text: str, config: PreprocessConfig) -> Tuple[str, ...]:
+    """Uncached pipeline; returns a tuple so cached results can't be mutated."""
     ensure_nltk_resources()
 
     # Clean the text
     normalized = normalize_text(text, config)
     
-    # Split into words
-    tokens = word_tokenize(normalized)
-
     # Remove common words that don't carry meaning
-    if config.remove_stopwords:
-        stop_words = set(stopwords.words(config.language))
-        tokens = [t for t in tokens if t not in stop_words]
-
-    # Reduce words to their base form (e.g., "universities" -> "university")
-    lemmatizer = WordNetLemmatizer()
-    tokens = [lemmatizer.lemmatize(t) for t in tokens]
-
-    # Remove single-character noise but keep numbers
-    tokens = [t for t in tokens if len(t) > 1 or t.isdigit()]
-
-    return tokens
+    stop_words = _get_stopwords(config.language) if config.remove_stopwords else frozenset()
+
+    # Tokenize, drop stopwords, lemmatize (e.g., "universities" -> "university"),
+    # and drop single-character noise but keep numbers - all in one pass.
+    # Stopwords are skipped before lemmatizing so we never lemmatize them.
+    tokens = [
+        lemma
+        for t in word_tokenize(normalized)
+        if t not in stop_words
+        and ((lemma := _LEMMATIZER.lemmatize(t)) and (len(lemma) > 1 or lemma.isdigit()))
+    ]
+
+    return tuple(tokens)
 
 
 if __name__ == "__main__":
@@ -2,10 +2,18 @@
 # Finds relevant knowledge to ground the chatbot's responses in facts
 
 from dataclasses import dataclass
-from typing import Callable, List, Tuple
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Tuple
 
 import numpy as np
 
+# Knowledge bases bigger than this get an approximate (HNSW) index
+ANN_MIN_DOCS = 1000
+
+# Batches bigger than this use the compiled bulk embedder (needs numba).
+# Below it, importing numba and loading the kernel costs more than it saves.
+BULK_EMBED_MIN_TEXTS = 200_000
+
 
 @dataclass
 class Document:
@@ -15,6 +23,44 @@ class Document:
     metadata: dict
 
 
+@dataclass
+class KnowledgeIndex:
+    """
+    Documents paired with their precomputed embedding matrix.
+    
+    ann_index is an optional hnswlib graph for large knowledge bases;
+    when it's None, retrieve() scores every document exactly.
+    """
+    docs: List[Document]
+    embeddings: np.ndarray
+    ann_index: Optional[Any] = None
+
+
+@lru_cache(maxsize=None)
+def _bulk_embed_kernel():
+    """Numba kernel for bulk embedding, imported on first use (None without numba)."""
+    try:
+        from numba import njit, prange
+    except ImportError:  # optional: bulk embedding falls back to the NumPy loop
+        return None
+
+    # cache=True keeps the compiled kernel on disk across processes
+    @njit(parallel=True, cache=True)
+    def embed_bulk(buf, starts, ends, out, dim):
+        """Bucket-count the bytes of each text into out, then L2-normalize rows."""
+        for i in prange(len(starts)):
+            for j in range(starts[i], ends[i]):
+                out[i, buf[j] % dim] += 1.0
+            norm = 0.0
+            for d in range(dim):
+                norm += out[i, d] * out[i, d]
+            norm = np.sqrt(norm) + 1e-8
+            for d in range(dim):
+                out[i, d] /= norm
+
+    return embed_bulk
+
+
 def default_embed(texts: List[str]) -> np.ndarray:
     """
     Simple hash-based embedding for testing.
@@ -23,16 +69,35 @@ def default_embed(texts: List[str]) -> np.ndarray:
     This just gives us consistent vectors for demo purposes.
     """
     dim = 64
+    encoded = [text.lower().encode("utf-8", "ignore") for text in texts]
+
+    embed_bulk = _bulk_embed_kernel() if len(encoded) > BULK_EMBED_MIN_TEXTS else None
+    if embed_bulk is not None:
+        # Index building: one flat byte buffer + offsets, embedded in parallel
+        lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+        ends = np.cumsum(lengths)
+        starts = ends - lengths
+        buf = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        out = np.zeros((len(encoded), dim), dtype=np.float32)
+        embed_bulk(buf, starts, ends, out, dim)
+        return out
+
     vectors = []
     
-    for text in texts:
-        vec = np.zeros(dim, dtype=np.float32)
-        for char in text.lower():
-            vec[ord(char) % dim] += 1.0
-        norm = np.linalg.norm(vec) + 1e-8
-        vectors.append(vec / norm)
+    for data in encoded:
+        # Count byte buckets in one C call instead of looping per character
+        codes = np.frombuffer(data, dtype=np.uint8)
+        vec = np.bincount(codes % dim, minlength=dim).astype(np.float32)
+        vec /= np.linalg.norm(vec) + 1e-8
+        vectors.append(vec)
     
-    return np.vstack(vectors)
+    return np.stack(vectors)
+
+
+@lru_cache(maxsize=2048)
+def _embed_query(text: str) -> Tuple[float, ...]:
+    """Cached default_embed of one query; repeated questions skip re-embedding."""
+    return tuple(default_embed([text])[0].tolist())
 
 
 def build_knowledge_base() -> List[Document]:
@@ -76,9 +141,53 @@ def build_knowledge_base() -> List[Document]:
     ]
 
 
+def build_index(
+    documents: List[Document],
+    embed_fn: Callable[[List[str]], np.ndarray] = default_embed,
+    dtype: np.dtype = np.float32,
+) -> KnowledgeIndex:
+    """
+    Embed the knowledge base once so queries don't have to.
+    
+    Call this at startup and reuse the index for every query.
+    Use the same embed_fn here and in retrieve(). Vectors are
+    L2-normalized here, so embed_fn doesn't have to normalize.
+    
+    Pass dtype=np.float16 to halve the memory of a large doc matrix.
+    NumPy has no BLAS kernel for float16, so scoring is slower on CPU;
+    float32 stays the default.
+    """
+    doc_texts = [doc.text for doc in documents]
+    vectors = np.ascontiguousarray(embed_fn(doc_texts), dtype=np.float32)
+    # Normalize once here so every query is a single dot product (cosine)
+    vectors = vectors / (np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-8)
+    return KnowledgeIndex(
+        docs=list(documents),
+        embeddings=vectors.astype(dtype, copy=False),
+        ann_index=_build_ann_index(vectors),
+    )
+
+
+def _build_ann_index(embeddings: np.ndarray):
+    """HNSW graph over the embeddings, or None for small KBs / no hnswlib."""
+    num_docs, dim = embeddings.shape
+    if num_docs <= ANN_MIN_DOCS:
+        return None
+
+    try:
+        import hnswlib
+    except ImportError:  # optional: large knowledge bases fall back to a full scan
+        return None
+
+    ann = hnswlib.Index(space="cosine", dim=dim)
+    ann.init_index(max_elements=num_docs, ef_construction=200, M=16)
+    ann.add_items(embeddings, np.arange(num_docs))
+    return ann
+
+
 def retrieve(
     query: str,
-    documents: List[Document],
+    index: KnowledgeIndex,
     embed_fn: Callable[[List[str]], np.ndarray] = default_embed,
     top_k: int = 3,
 ) -> List[Tuple[Document, float]]:
@@ -86,20 +195,42 @@ def retrieve(
     Find the most relevant documents for a user query.
     
     Uses cosine similarity between query and document embeddings.
+    Only the query is embedded here; documents come from the index.
     Returns documents sorted by relevance with their scores.
     """
-    doc_texts = [doc.text for doc in documents]
-    doc_embeddings = embed_fn(doc_texts)
+    if embed_fn is default_embed:
+        query_embedding = np.asarray(_embed_query(query), dtype=np.float32)
+    else:
+        # Custom embedders may not be deterministic or normalized, so don't
+        # cache them and normalize the query ourselves
+        query_embedding = np.asarray(embed_fn([query])[0], dtype=np.float32)
+        query_embedding = query_embedding / (np.linalg.norm(query_embedding) + 1e-8)
     
-    query_embedding = embed_fn([query])[0]
+    if index.ann_index is not None:
+        # Approximate search: sub-linear in KB size, trades a little recall
+        k = min(top_k, len(index.docs))
+        if k <= 0:
+            return []
+        index.ann_index.set_ef(max(50, k))
+        labels, distances = index.ann_index.knn_query(query_embedding, k=k)
+        return [
+            (index.docs[i], 1.0 - float(d))  # cosine distance -> similarity
+            for i, d in zip(labels[0], distances[0])
+        ]
     
     # Cosine similarity (embeddings are normalized)
-    similarities = (doc_embeddings @ query_embedding).tolist()
+    # Cast the query (not the matrix) to the stored precision
+    query_embedding = query_embedding.astype(index.embeddings.dtype, copy=False)
+    similarities = (index.embeddings @ query_embedding).astype(np.float32, copy=False)
     
-    scored_docs = list(zip(documents, similarities))
-    scored_docs.sort(key=lambda x: x[1], reverse=True)
+    # Partition out the top_k first, then sort only those
+    if top_k < len(similarities):
+        top_idx = np.argpartition(-similarities, top_k)[:top_k]
+    else:
+        top_idx = np.arange(len(similarities))
+    top_idx = top_idx[np.argsort(-similarities[top_idx], kind="stable")]
     
-    return scored_docs[:top_k]
+    return [(index.docs[i], float(similarities[i])) for i in top_idx]
 
 
 if __name__ == "__main__":
@@ -107,10 +238,11 @@ if __name__ == "__main__":
     print("=" * 60)
     
     kb = build_knowledge_base()
+    index = build_index(kb)
     print(f"Knowledge base size: {len(kb)} documents")
     
     query = "How do I write a strong SOP for MS?"
-    results = retrieve(query, kb)
+    results = retrieve(query, index)
     
     print(f"\nQuery: {query}")
     print("\nTop 3 Results:")
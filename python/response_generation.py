@@ -45,6 +45,41 @@ INTENT_GUIDANCE = {
 }
 
 
+DEFAULT_GUIDANCE = (
+    "Please clarify whether you need help with admissions, SOP, "
+    "scholarships, or test preparation."
+)
+
+VERIFY_NOTE = (
+    "For official deadlines and fee amounts, always verify on the "
+    "university/program website."
+)
+
+
+def _escape_braces(text: str) -> str:
+    """Make literal text safe to embed in a str.format template."""
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+def _build_template(intent: str, guidance: str) -> str:
+    """Response skeleton with everything but context and passages filled in."""
+    return (
+        "**Intent detected:** " + intent + "{context}{passages}\n"
+        "\n**Guidance:**\n"
+        "• " + _escape_braces(guidance) + "\n"
+        "\n**Note:**\n"
+        "• " + _escape_braces(VERIFY_NOTE)
+    )
+
+
+# Built once at import; generate_response only fills in the per-turn parts
+_TEMPLATES = {
+    intent: _build_template(_escape_braces(intent), guidance)
+    for intent, guidance in INTENT_GUIDANCE.items()
+}
+_FALLBACK_TEMPLATE = _build_template("{intent}", DEFAULT_GUIDANCE)
+
+
 def generate_response(inputs: GenerationInputs) -> str:
     """
     Generate a response that's grounded in facts.
@@ -52,34 +87,21 @@ def generate_response(inputs: GenerationInputs) -> str:
     We use the retrieved passages as our source of truth and add
     intent-specific guidance. Always reminds users to verify details.
     """
-    lines: List[str] = []
-
-    lines.append(f"**Intent detected:** {inputs.intent}")
-
+    context = ""
     if inputs.dialogue_context:
-        lines.append(f"**Context:** {inputs.dialogue_context}")
+        context = f"\n**Context:** {inputs.dialogue_context}"
 
+    passages = ""
     if inputs.retrieved_passages:
-        lines.append("\n**Relevant Information:**")
-        for passage in inputs.retrieved_passages[:3]:
-            lines.append(f"• {passage}")
-
-    lines.append("\n**Guidance:**")
-    guidance = INTENT_GUIDANCE.get(
-        inputs.intent, 
-        "Please clarify whether you need help with admissions, SOP, "
-        "scholarships, or test preparation."
-    )
-    lines.append(f"• {guidance}")
+        passages = "\n\n**Relevant Information:**\n" + "\n".join(
+            f"• {passage}" for passage in inputs.retrieved_passages[:3]
+        )
 
-    lines.append("\n**Note:**")
-    lines.append(
-        "• For official deadlines and fee amounts, always verify on the "
-        "university/program website."
+    template = _TEMPLATES.get(inputs.intent, _FALLBACK_TEMPLATE)
+    return template.format_map(
+        {"intent": inputs.intent, "context": context, "passages": passages}
     )
 
-    return "\n".join(lines)
-
 
 if __name__ == "__main__":
     print("Response Generation Demo")